@@ -1,10 +1,11 @@
+import os
 import time
 import json
+import itertools
 import shutil
 
-from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from src.logger import get_logger
 from src.factory import MCPServiceFactory
@@ -16,6 +17,34 @@ from src.agents import MCPMarkAgent
 # Initialize logger
 logger = get_logger(__name__)
 
+# Top-level meta.json keys needed to rebuild a TaskResult
+_META_FIELDS = (
+    "task_name",
+    "execution_result",
+    "token_usage",
+    "turn_count",
+    "agent_execution_time",
+    "task_execution_time",
+)
+
+
+def _load_meta(meta_path: Union[str, Path]) -> dict:
+    """Parse a task's meta.json."""
+    with open(meta_path, "rb") as f:
+        return json.loads(f.read())
+
+
+def _parse_task_filter(flt: str) -> tuple[Optional[str], Optional[str]]:
+    """Split a filter string into (category_id, task_id); None matches anything."""
+    if flt.lower() == "all":
+        return None, None
+    if "/" in flt:
+        # specific task (category_id/task_id)
+        category_id, task_id = flt.split("/", 1)
+        return category_id, task_id
+    # category level
+    return flt, None
+
 
 class MCPEvaluator:
     def __init__(
@@ -78,22 +107,46 @@ class MCPEvaluator:
         self.base_experiment_dir = output_dir / f"{model_slug}__{service_for_dir}" / exp_name
         self.base_experiment_dir.mkdir(parents=True, exist_ok=True)
 
+        # Parsed meta.json contents keyed by path, validated by (mtime, size)
+        self._meta_cache: dict[str, tuple[tuple[int, int], dict]] = {}
+        # Output directories keyed by (category_id, task_id), computed once per task
+        self._task_output_dirs: dict[tuple, Path] = {}
+
     def _format_duration(self, seconds: float) -> str:
         """Format duration: <1s as ms, otherwise seconds."""
         return f"{(seconds * 1000):.2f}ms" if seconds < 1 else f"{seconds:.2f}s"
 
     def _get_task_output_dir(self, task) -> Path:
         """Return the directory path for storing this task's reports using '__' separator."""
-        # Use category_id and task_id with '__' separator
-        category_id = task.category_id if task.category_id else "uncategorized"
-        task_id = str(task.task_id)
-
-        return self.base_experiment_dir / f"{category_id}__{task_id}"
+        key = (task.category_id, task.task_id)
+        task_dir = self._task_output_dirs.get(key)
+        if task_dir is None:
+            # Use category_id and task_id with '__' separator
+            category_id = task.category_id if task.category_id else "uncategorized"
+            task_id = str(task.task_id)
+            task_dir = self.base_experiment_dir / f"{category_id}__{task_id}"
+            self._task_output_dirs[key] = task_dir
+        return task_dir
 
     # ------------------------------------------------------------------
     # Resuming helpers
     # ------------------------------------------------------------------
 
+    def _read_meta(self, meta_path: Union[str, Path]) -> dict:
+        """Return the parsed meta.json at *meta_path*, re-parsing only if it changed."""
+        meta_path = os.fspath(meta_path)
+        st = os.stat(meta_path)
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._meta_cache.get(meta_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        # Keep only what TaskResult needs so large extra keys are not retained
+        parsed = _load_meta(meta_path)
+        meta_data = {k: parsed[k] for k in _META_FIELDS if k in parsed}
+        self._meta_cache[meta_path] = (key, meta_data)
+        return meta_data
+
     def _load_latest_task_result(self, task) -> Optional[TaskResult]:
         """Return the most recent TaskResult for *task* if it has been run before."""
         task_dir = self._get_task_output_dir(task)
@@ -105,8 +158,7 @@ class MCPEvaluator:
             return None
 
         try:
-            with meta_path.open("r", encoding="utf-8") as f:
-                meta_data = json.load(f)
+            meta_data = self._read_meta(meta_path)
 
             return TaskResult(
                 task_name=meta_data["task_name"],
@@ -126,23 +178,35 @@ class MCPEvaluator:
             logger.warning("Failed to load existing result for %s: %s", task.name, exc)
         return None
 
-    def _gather_all_task_results(self) -> List[TaskResult]:
-        """Scan *all* task sub-directories and collect the latest TaskResult from each."""
+    def _gather_all_task_results(self, task_filter: str) -> List[TaskResult]:
+        """Scan task sub-directories matching *task_filter* and collect the latest TaskResult from each."""
         results: list[TaskResult] = []
         if not self.base_experiment_dir.exists():
             return results
 
-        for task_dir in self.base_experiment_dir.iterdir():
-            if not task_dir.is_dir():
-                continue
-            meta_path = task_dir / "meta.json"
-            if not meta_path.exists():
-                continue
+        # One scandir pass: DirEntry.is_dir() uses the cached d_type, and a
+        # missing meta.json surfaces from the stat in _read_meta. Directories
+        # whose name does not match the filter are never opened.
+        flt_category_id, flt_task_id = _parse_task_filter(task_filter)
+        task_entries = []
+        with os.scandir(self.base_experiment_dir) as it:
+            for entry in it:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                parts = entry.name.split("__", 1)
+                if len(parts) == 2 and (
+                    (flt_category_id is not None and parts[0] != flt_category_id)
+                    or (flt_task_id is not None and parts[1] != flt_task_id)
+                ):
+                    continue
+                task_entries.append(entry)
+
+        for entry in task_entries:
+            meta_path = os.path.join(entry.path, "meta.json")
             try:
-                with meta_path.open("r", encoding="utf-8") as f:
-                    meta_data = json.load(f)
+                meta_data = self._read_meta(meta_path)
 
-                category_id, task_id = task_dir.name.split("__", 1)
+                category_id, task_id = entry.name.split("__", 1)
 
                 result = TaskResult(
                     task_name=meta_data["task_name"],
@@ -159,9 +223,11 @@ class MCPEvaluator:
                     task_execution_time=meta_data.get("task_execution_time", 0.0),
                 )
                 results.append(result)
+            except FileNotFoundError:
+                continue
             except Exception as exc:
                 logger.warning(
-                    "Failed to parse existing report in %s: %s", task_dir, exc
+                    "Failed to parse existing report in %s: %s", Path(entry.path), exc
                 )
         return results
 
@@ -252,8 +318,6 @@ class MCPEvaluator:
             result = self.task_manager.execute_task(task, agent_result)
         finally:
             # Clean up environment variables
-            import os
-
             os.environ.pop("MCP_MESSAGES", None)
             os.environ.pop("MCP_GITHUB_TOKEN", None)
             
@@ -314,6 +378,7 @@ class MCPEvaluator:
                 task_output_dir = self._get_task_output_dir(task)
                 if task_output_dir.exists():
                     shutil.rmtree(task_output_dir)
+                self._meta_cache.pop(os.fspath(task_output_dir / "meta.json"), None)
                 logger.info(
                     "🔄 Retrying task due to pipeline error (%s): %s",
                     existing_result.error_message,
@@ -336,12 +401,9 @@ class MCPEvaluator:
             # Save messages.json (conversation trajectory)
             messages_path = task_output_dir / "messages.json"
 
-            if not messages_path.exists():  # 已经写过就跳过
-                messages = (
-                    task_result.model_output
-                    if getattr(task_result, "model_output", None)
-                    else []
-                )
+            # Skip when there is no output to record or it was already written
+            messages = task_result.model_output
+            if messages and not messages_path.exists():  # 已经写过就跳过
                 self.results_reporter.save_messages_json(messages, messages_path)
 
             # Save meta.json (all other metadata)
@@ -356,8 +418,8 @@ class MCPEvaluator:
             self.results_reporter.save_meta_json(
                 task_result,
                 model_config,
-                datetime.fromtimestamp(task_start),
-                datetime.fromtimestamp(task_end),
+                task_start,
+                task_end,
                 meta_path,
             )
 
@@ -366,29 +428,16 @@ class MCPEvaluator:
         # saved TaskResults that ALSO match the current task_filter.
         # --------------------------------------------------------------
 
-        # Helper: determine if a TaskResult matches the filter string
-        def _matches_filter(tr: TaskResult, flt: str) -> bool:
-            if flt.lower() == "all":
-                return True
-            if "/" in flt:
-                # specific task (category_id/task_id)
-                category_id, task_id = flt.split("/", 1)
-                return tr.category_id == category_id and str(tr.task_id) == task_id
-            # category level
-            return tr.category_id == flt
-
-        # Pull existing reports from disk and merge
-        existing_results = [
-            r
-            for r in self._gather_all_task_results()
-            if _matches_filter(r, task_filter)
-        ]
-
-        # Merge, giving preference to fresh `results` (avoids duplicates)
-        merged: dict[str, TaskResult] = {r.task_name: r for r in existing_results}
-        merged.update({r.task_name: r for r in results})  # overwrite with latest run
+        # Pull existing reports from disk (filtered by directory name) and merge
+        existing_results = self._gather_all_task_results(task_filter)
+
+        # Merge in one pass, giving preference to fresh `results` (avoids duplicates)
+        merged: dict[str, TaskResult] = {}
+        for r in itertools.chain(existing_results, results):
+            merged[r.task_name] = r  # later entries (latest run) overwrite
 
         final_results = list(merged.values())
+        successful_tasks = sum(1 for r in final_results if r.success)
 
         aggregated_report = EvaluationReport(
             model_name=self.model_name,
@@ -400,8 +449,8 @@ class MCPEvaluator:
                 "timeout": self.timeout,
             },
             total_tasks=len(final_results),
-            successful_tasks=sum(1 for r in final_results if r.success),
-            failed_tasks=sum(1 for r in final_results if not r.success),
+            successful_tasks=successful_tasks,
+            failed_tasks=len(final_results) - successful_tasks,
             task_results=final_results,
             tasks_filter=task_filter,
         )
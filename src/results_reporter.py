@@ -7,6 +7,7 @@ This module provides utilities for saving evaluation results in a structured for
 """
 
 import json
+import os
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +19,21 @@ from src.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _write_json(data: Any, output_path: Path) -> None:
+    """Write *data* as indented UTF-8 JSON."""
+    encoded = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+    # Write the encoded bytes straight to the fd, skipping the TextIOWrapper.
+    # 0o666 matches the mode open() uses, so the umask still applies.
+    data_view = memoryview(encoded)
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        while data_view:
+            data_view = data_view[os.write(fd, data_view):]
+    finally:
+        os.close(fd)
+
+
 @dataclass
 class TaskResult:
     """
@@ -246,16 +262,15 @@ class ResultsReporter:
     def save_messages_json(self, messages: Any, output_path: Path) -> Path:
         """Saves the conversation messages/trajectory as messages.json."""
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(messages, f, indent=2, ensure_ascii=False)
+        _write_json(messages, output_path)
         return output_path
 
     def save_meta_json(
         self,
         task_result: TaskResult,
         model_config: Dict[str, Any],
-        start_time: datetime,
-        end_time: datetime,
+        start_time: float,
+        end_time: float,
         output_path: Path,
     ) -> Path:
         """Saves task metadata (excluding messages) as meta.json."""
@@ -268,7 +283,10 @@ class ResultsReporter:
             "reasoning_effort": model_config.get("reasoning_effort"),
             "mcp": model_config.get("mcp_service", "unknown"),
             "timeout": model_config.get("timeout", 300),
-            "time": {"start": start_time.isoformat(), "end": end_time.isoformat()},
+            "time": {
+                "start": datetime.fromtimestamp(start_time).isoformat(),
+                "end": datetime.fromtimestamp(end_time).isoformat(),
+            },
             "agent_execution_time": task_result.agent_execution_time,
             "task_execution_time": task_result.task_execution_time,
             "execution_result": {
@@ -281,8 +299,7 @@ class ResultsReporter:
             "turn_count": task_result.turn_count,
         }
 
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(meta_data, f, indent=2, ensure_ascii=False)
+        _write_json(meta_data, output_path)
         return output_path
 
     def save_model_summary(self, report: EvaluationReport, output_path: Path) -> Path:
@@ -348,6 +365,5 @@ class ResultsReporter:
             },
         }
 
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        _write_json(summary, output_path)
         return output_path